@@ -12,14 +12,20 @@ Strict Student Fee Manager (PyQt5)
 
 import sys
 import os
+import re
 from datetime import datetime, date
+import numpy as np
 import pandas as pd
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-    QTableWidgetItem, QFileDialog, QLineEdit, QLabel, QMessageBox, QInputDialog,
-    QDialog, QFormLayout, QDialogButtonBox, QDateEdit, QSpinBox, QComboBox
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+    QFileDialog, QLineEdit, QLabel, QMessageBox, QInputDialog,
+    QDialog, QFormLayout, QDialogButtonBox, QDateEdit, QSpinBox, QComboBox,
+    QProgressDialog
+)
+from PyQt5.QtCore import (
+    QDate, Qt, QAbstractTableModel, QModelIndex, QTimer, QObject, QRunnable,
+    QThreadPool, pyqtSignal
 )
-from PyQt5.QtCore import QDate
 from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib import colors
@@ -35,18 +41,129 @@ STRICT_COLUMNS = [
 ]
 
 DATE_FORMAT = "%Y-%m-%d"  # YYYY-MM-DD
+QDATE_FORMAT = "yyyy-MM-dd"  # same format for QDate.toString
+
+# Low-cardinality text columns kept as pandas categoricals
+CATEGORY_COLUMNS = ["Year", "Dept"]
 
 
 def today_str():
     return date.today().strftime(DATE_FORMAT)
 
 
+def to_display_strings(df):
+    """Return df[STRICT_COLUMNS] with every cell as a str ("" for missing)."""
+    df = df[STRICT_COLUMNS]
+    return df.astype(object).where(df.notna(), "").astype(str)
+
+
+def add_categories(df, rec):
+    """Register rec's Year/Dept values as categories so they can be written into df."""
+    for c in CATEGORY_COLUMNS:
+        if isinstance(df[c].dtype, pd.CategoricalDtype) and rec[c] not in df[c].cat.categories:
+            df[c] = df[c].cat.add_categories([rec[c]])
+
+
+def parquet_cache_path(path):
+    return path + ".parquet"
+
+
+def write_parquet_cache(df, path):
+    """Write a columnar sidecar next to the xlsx (skipped without pyarrow)."""
+    cache = parquet_cache_path(path)
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return
+    out = df[STRICT_COLUMNS].copy()
+    # parquet needs one type per column; text columns may mix str/int after edits
+    for c in out.columns:
+        if out[c].dtype == object:
+            out[c] = out[c].where(out[c].notna(), "").astype(str)
+    # due month/year columns let readers push date filters down to pyarrow
+    parsed = pd.to_datetime(out["Due Date"], errors='coerce')
+    out["_due_year"] = parsed.dt.year.fillna(0).astype("int16")
+    out["_due_month"] = parsed.dt.month.fillna(0).astype("int16")
+    try:
+        out.to_parquet(cache, engine="pyarrow", compression="zstd", index=False)
+    except Exception:
+        # never leave a stale sidecar that could shadow the xlsx
+        if os.path.exists(cache):
+            os.remove(cache)
+
+
+def read_strict_file(path, month=None, year=None):
+    """Read a strict file, preferring its parquet sidecar when it is up to date.
+
+    If month and/or year are given only rows whose Due Date matches are
+    returned; with a sidecar the filter is pushed down to pyarrow.
+    """
+    filters = []
+    if year is not None:
+        filters.append(("_due_year", "=", year))
+    if month is not None:
+        filters.append(("_due_month", "=", month))
+    cache = parquet_cache_path(path)
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        try:
+            return pd.read_parquet(cache, engine="pyarrow", columns=STRICT_COLUMNS,
+                                   filters=filters or None)
+        except Exception:
+            pass  # unreadable or pyarrow missing: fall back to the xlsx
+    df = pd.read_excel(path)
+    if filters and "Due Date" in df.columns:
+        parsed = pd.to_datetime(df["Due Date"], errors='coerce')
+        mask = pd.Series(True, index=df.index)
+        if year is not None:
+            mask &= parsed.dt.year == year
+        if month is not None:
+            mask &= parsed.dt.month == month
+        df = df[mask].reset_index(drop=True)
+    return df
+
+
+def write_excel(df, path):
+    """Write df to path with xlsxwriter (faster than openpyxl) when it is installed."""
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        df.to_excel(path, index=False)
+        return
+    df.to_excel(path, index=False, engine="xlsxwriter")
+
+
+class DFModel(QAbstractTableModel):
+    """Read-only table model that serves cells lazily from a pre-stringified DataFrame."""
+    def __init__(self, df_str=None, parent=None):
+        super().__init__(parent)
+        self._df_str = df_str if df_str is not None else pd.DataFrame(columns=STRICT_COLUMNS)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._df_str)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(STRICT_COLUMNS)
+
+    def data(self, idx, role=Qt.DisplayRole):
+        if not idx.isValid() or role != Qt.DisplayRole:
+            return None
+        return self._df_str.iat[idx.row(), idx.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return STRICT_COLUMNS[section]
+        return str(section + 1)
+
+
 class StudentDialog(QDialog):
     """Dialog to Add / Edit a row using strict columns."""
     def __init__(self, data=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Student Record")
         self.data = data or {}
+        self._today = today_str()  # the date won't change while the dialog is open
         self.widgets = {}
         form = QFormLayout()
 
@@ -118,9 +235,13 @@ class StudentDialog(QDialog):
         dlg_layout.addWidget(buttons)
         self.setLayout(dlg_layout)
 
-        # connect to update balance when fee fields change
-        self.widgets["Fee Amount"].valueChanged.connect(self._update_balance_field)
-        self.widgets["Fee Paid"].valueChanged.connect(self._update_balance_field)
+        # update balance once the fee fields stop changing (spin repeats emit per step)
+        self._balance_timer = QTimer(self)
+        self._balance_timer.setSingleShot(True)
+        self._balance_timer.setInterval(50)
+        self._balance_timer.timeout.connect(self._update_balance_field)
+        self.widgets["Fee Amount"].valueChanged.connect(lambda _v: self._balance_timer.start())
+        self.widgets["Fee Paid"].valueChanged.connect(lambda _v: self._balance_timer.start())
         # initialize balance field
         self._update_balance_field()
 
@@ -131,7 +252,7 @@ class StudentDialog(QDialog):
         self.widgets["Balance"].setText(str(bal))
         # set Fee Paid On / Due Date based on balance
         if bal == 0:
-            self.widgets["Fee Paid On"].setText(today_str())
+            self.widgets["Fee Paid On"].setText(self._today)
         else:
             self.widgets["Fee Paid On"].setText("")
 
@@ -148,13 +269,97 @@ class StudentDialog(QDialog):
         out["Balance"] = int(out["Fee Amount"]) - int(out["Fee Paid"])
         # Due Date: get string YYYY-MM-DD
         due_qdate = self.widgets["Due Date"].date()
-        out["Due Date"] = due_qdate.toString("yyyy-MM-dd")
+        out["Due Date"] = due_qdate.toString(QDATE_FORMAT)
         out["Email"] = self.widgets["Email"].text().strip()
         # Fee Paid On: if balance==0 set today else blank
-        out["Fee Paid On"] = today_str() if out["Balance"] == 0 else ""
+        out["Fee Paid On"] = self._today if out["Balance"] == 0 else ""
         return out
 
 
+class MailSignals(QObject):
+    progress = pyqtSignal(int, int)  # processed, total
+    failed = pyqtSignal(str, str)  # recipient, error
+    done = pyqtSignal(int, int)  # sent, skipped
+
+
+class MailWorker(QRunnable):
+    """Sends reminder emails over one SMTP session on a pool thread."""
+    def __init__(self, recipients, smtp_cfg):
+        super().__init__()
+        self.recipients = recipients  # list of row dicts
+        self.cfg = smtp_cfg
+        self.signals = MailSignals()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.cfg["server"], self.cfg["port"], timeout=20)
+        server.ehlo()
+        server.starttls()
+        server.ehlo()
+        server.login(self.cfg["sender"], self.cfg["password"])
+        return server
+
+    def _build_message(self, row, to):
+        sender = self.cfg["sender"]
+        subject = "Fee Payment Reminder"
+        body = f"Hello {row['Name']},\n\nThis is a gentle reminder that your pending fee balance is{row['Balance']}.\n"
+        if row.get("Due Date"):
+            body += f"Due Date: {row['Due Date']}\n"
+        body += f"Kindly make the payment at the earliest to avoid any late charges.\nIf you have already completed the payment, please disregard this message.\nThank you for your prompt attention.\nPlease pay at the earliest.\n\nRegards,\nPyLinX Hub"
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["From"] = sender
+        msg["To"] = to
+        return msg
+
+    def run(self):
+        total = len(self.recipients)
+        sender = self.cfg["sender"]
+        # one session for the whole batch instead of a handshake per email
+        try:
+            server = self._connect()
+        except Exception as e:
+            self.signals.failed.emit("(SMTP login)", str(e))
+            self.signals.done.emit(0, total)
+            return
+
+        has_email = [pd.notna(row["Email"]) and str(row["Email"]).strip() != "" for row in self.recipients]
+        sendable = sum(has_email)
+        sent = 0
+        send_errors = 0  # SMTP errors only; missing addresses say nothing about the server
+        processed = 0
+        try:
+            for row, ok in zip(self.recipients, has_email):
+                # give up on large batches once a third of the sends have failed
+                if sendable >= 30 and send_errors * 3 >= sendable:
+                    break
+                processed += 1
+                if not ok:
+                    self.signals.failed.emit("(no email)", "missing email")
+                    self.signals.progress.emit(processed, total)
+                    continue
+                to = str(row["Email"])
+                msg = self._build_message(row, to)
+                try:
+                    try:
+                        server.sendmail(sender, [to], msg.as_string())
+                    except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError):
+                        # session dropped: reconnect and retry once
+                        server = self._connect()
+                        server.sendmail(sender, [to], msg.as_string())
+                    sent += 1
+                except Exception as e:
+                    # record exact exception string so user can see what's wrong
+                    send_errors += 1
+                    self.signals.failed.emit(to, str(e))
+                self.signals.progress.emit(processed, total)
+        finally:
+            try:
+                server.quit()
+            except Exception:
+                pass
+        self.signals.done.emit(sent, total - processed)
+
+
 class FeeManagerApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -162,8 +367,16 @@ class FeeManagerApp(QWidget):
         self.resize(1150, 700)
 
         self.files = {}  # display name -> (full_path, dataframe)
+        self._partial = set()  # display names opened with a month/year prefilter
         self.selected_name = None
         self.current_df_view = None
+        self._view_to_base = np.array([], dtype=int)  # table row -> stored frame label
+        self._search_index = {}  # display name -> per-row search haystack
+        self._due_parsed = {}  # display name -> due_month/due_year int16 frame
+        self._display_str = {}  # display name -> table cells as strings
+        self._mail_worker = None
+        self._mail_failed = []
+        self._mail_progress = None
 
         self._build_ui()
 
@@ -180,6 +393,10 @@ class FeeManagerApp(QWidget):
         btn_open.clicked.connect(self.open_file)
         top.addWidget(btn_open)
 
+        btn_open_month = QPushButton("Open Month/Year (read-only)")
+        btn_open_month.clicked.connect(self.open_file_prefiltered)
+        top.addWidget(btn_open_month)
+
         btn_save = QPushButton("Save Current")
         btn_save.clicked.connect(self.save_current)
         top.addWidget(btn_save)
@@ -191,7 +408,12 @@ class FeeManagerApp(QWidget):
 
         top.addWidget(QLabel("Search:"))
         self.search = QLineEdit(); self.search.setPlaceholderText("Search across all columns")
-        self.search.textChanged.connect(self.apply_search)
+        # debounce: only filter once typing pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._do_search)
+        self.search.textChanged.connect(lambda _text: self._search_timer.start())
         top.addWidget(self.search)
 
         # Date filter
@@ -217,9 +439,10 @@ class FeeManagerApp(QWidget):
         main.addLayout(top)
 
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(len(STRICT_COLUMNS))
-        self.table.setHorizontalHeaderLabels(STRICT_COLUMNS)
+        self.table = QTableView()
+        self.model = DFModel(parent=self)
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
         main.addWidget(self.table)
 
         # Buttons row
@@ -255,12 +478,14 @@ class FeeManagerApp(QWidget):
         # create df with strict columns exactly in order
         df = pd.DataFrame(columns=STRICT_COLUMNS)
         try:
-            df.to_excel(path, index=False)
+            write_excel(df, path)
+            write_parquet_cache(df, path)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to create file: {e}")
             return
         name = os.path.basename(path)
         self.files[name] = (path, df)
+        self._invalidate_caches(name)
         if self.combo.findText(name) == -1:
             self.combo.addItem(name)
         self.combo.setCurrentText(name)
@@ -270,35 +495,74 @@ class FeeManagerApp(QWidget):
         path, _ = QFileDialog.getOpenFileName(self, "Open strict Excel", "", "Excel files (*.xlsx)")
         if not path:
             return
+        self._load_file(path, os.path.basename(path))
+
+    def open_file_prefiltered(self):
+        mon = self.month_combo.currentText()
+        yr_text = self.filter_year.text().strip()
+        month = None if mon == "All" else int(mon)
+        year = None
+        if yr_text:
+            try:
+                year = int(yr_text)
+            except ValueError:
+                QMessageBox.warning(self, "Year", "Year must be numeric")
+                return
+        if month is None and year is None:
+            QMessageBox.warning(self, "Filter", "Choose a month and/or year in the date filter first")
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Open strict Excel (month/year only)", "", "Excel files (*.xlsx)")
+        if not path:
+            return
+        label = f"{year if year is not None else '*'}-{f'{month:02d}' if month is not None else '*'}"
+        name = f"{os.path.basename(path)} [{label}]"
+        if self._load_file(path, name, month=month, year=year):
+            # only part of the file is loaded; saving would drop the other rows
+            self._partial.add(name)
+
+    def _load_file(self, path, name, month=None, year=None):
         try:
-            df = pd.read_excel(path)
+            df = read_strict_file(path, month=month, year=year)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to read Excel: {e}")
-            return
+            return False
         # validate strict header equality (order & names)
         if list(df.columns) != STRICT_COLUMNS:
             QMessageBox.critical(self, "Invalid format",
                                  "This file is not in the strict format.\n"
                                  "Only files created by this application with exact headers can be opened.")
-            return
+            return False
         # compute balance to ensure correctness
-        df = self._recalculate_business_rules(df)
-        name = os.path.basename(path)
+        df = self._recalc_full(df)
         self.files[name] = (path, df)
+        self._partial.discard(name)
+        self._invalidate_caches(name)
         if self.combo.findText(name) == -1:
             self.combo.addItem(name)
         self.combo.setCurrentText(name)
         QMessageBox.information(self, "Loaded", f"Loaded {name}")
+        return True
+
+    def _is_read_only(self):
+        # prefiltered files hold only some rows; changes could never be saved
+        if self.selected_name in self._partial:
+            QMessageBox.warning(self, "Read-only", "This file was opened for a single month/year and cannot be changed or saved")
+            return True
+        return False
 
     def save_current(self):
         if not self.selected_name:
             QMessageBox.warning(self, "No file", "No file selected")
             return
+        if self._is_read_only():
+            return
         path, df = self.files[self.selected_name]
-        df = self._recalculate_business_rules(df)
+        df = self._recalc_full(df)
         try:
-            df.to_excel(path, index=False)
+            write_excel(df, path)
+            write_parquet_cache(df, path)
             self.files[self.selected_name] = (path, df)
+            self._invalidate_caches(self.selected_name)
             QMessageBox.information(self, "Saved", f"Saved {self.selected_name}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save: {e}")
@@ -308,84 +572,116 @@ class FeeManagerApp(QWidget):
             return
         self.selected_name = name
         path, df = self.files[name]
-        self.current_df_view = df.copy()
+        self.current_df_view = df
         self.refresh_table(self.current_df_view)
 
     # ---------- table / CRUD ----------
     def refresh_table(self, df: pd.DataFrame):
-        self.table.setRowCount(0)
-        if df is None or df.empty:
-            return
-        self.table.setRowCount(len(df))
-        for i, (_, row) in enumerate(df.iterrows()):
-            for j, col in enumerate(STRICT_COLUMNS):
-                val = row.get(col, "")
-                display = "" if pd.isna(val) else str(val)
-                self.table.setItem(i, j, QTableWidgetItem(display))
+        if df is None:
+            df = pd.DataFrame(columns=STRICT_COLUMNS)
+        if self.selected_name in self.files:
+            # slice the file's cached display strings down to the view's rows
+            df_str = self._get_display_strings(self.selected_name)
+            if df is not self.files[self.selected_name][1]:
+                df_str = df_str.loc[df.index]
+        else:
+            df_str = to_display_strings(df)
+        self._view_to_base = df.index.to_numpy()
+        # swap the data without per-change repaints, sorting or signal churn
+        self.table.setUpdatesEnabled(False)
+        self.table.setSortingEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            self.model.beginResetModel()
+            self.model._df_str = df_str
+            self.model.endResetModel()
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+            self.table.viewport().update()
 
     def add_row(self):
         if not self.selected_name:
             QMessageBox.warning(self, "No file", "Create or open a strict file first")
             return
+        if self._is_read_only():
+            return
         dlg = StudentDialog(parent=self)
         if dlg.exec_():
             rec = dlg.get_data()
             path, df = self.files[self.selected_name]
-            row_df = pd.DataFrame([rec], columns=STRICT_COLUMNS)
-            df = pd.concat([df, row_df], ignore_index=True)
-            df = self._recalculate_business_rules(df)
+            # append the row (pandas still copies each column); only this row is recalculated
+            idx = len(df)
+            df.loc[idx] = [rec[c] for c in STRICT_COLUMNS]
+            # enlargement turns categoricals back into plain text columns
+            for c in CATEGORY_COLUMNS:
+                df[c] = df[c].astype("category")
+            self._recalc_row(df, idx)
             self.files[self.selected_name] = (path, df)
-            self.current_df_view = df.copy()
+            self._invalidate_caches(self.selected_name)
+            self.current_df_view = df
             self.refresh_table(self.current_df_view)
 
     def edit_selected(self):
         if not self.selected_name:
             QMessageBox.warning(self, "No file", "Open a strict file first")
             return
-        row_idx = self.table.currentRow()
+        if self._is_read_only():
+            return
+        row_idx = self.table.currentIndex().row()
         if row_idx < 0:
             QMessageBox.warning(self, "Select", "Select a row to edit")
             return
         path, df = self.files[self.selected_name]
-        existing = df.iloc[row_idx].to_dict()
+        # table rows index the (possibly filtered) view, not the stored frame
+        base_idx = self._view_to_base[row_idx]
+        existing = df.loc[base_idx].to_dict()
         dlg = StudentDialog(data=existing, parent=self)
         if dlg.exec_():
             updated = dlg.get_data()
-            for col in STRICT_COLUMNS:
-                df.at[row_idx, col] = updated.get(col, "")
-            df = self._recalculate_business_rules(df)
+            add_categories(df, updated)
+            df.loc[base_idx, STRICT_COLUMNS] = [updated.get(col, "") for col in STRICT_COLUMNS]
+            self._recalc_row(df, base_idx)
             self.files[self.selected_name] = (path, df)
-            self.current_df_view = df.copy()
+            self._invalidate_caches(self.selected_name)
+            self.current_df_view = df
             self.refresh_table(self.current_df_view)
 
     def delete_selected(self):
         if not self.selected_name:
             QMessageBox.warning(self, "No file", "Open a strict file first")
             return
-        row_idx = self.table.currentRow()
+        if self._is_read_only():
+            return
+        row_idx = self.table.currentIndex().row()
         if row_idx < 0:
             QMessageBox.warning(self, "Select", "Select row to delete")
             return
         path, df = self.files[self.selected_name]
-        df = df.drop(df.index[row_idx]).reset_index(drop=True)
-        df = self._recalculate_business_rules(df)
+        # remaining rows are unchanged, so no recalculation is needed
+        df = df.drop(self._view_to_base[row_idx]).reset_index(drop=True)
         self.files[self.selected_name] = (path, df)
-        self.current_df_view = df.copy()
+        self._invalidate_caches(self.selected_name)
+        self.current_df_view = df
         self.refresh_table(self.current_df_view)
 
     # ---------- search & filter ----------
-    def apply_search(self):
+    def _do_search(self):
         if not self.selected_name:
             return
-        keyword = self.search.text().strip().lower()
+        terms = self.search.text().split()
         path, df = self.files[self.selected_name]
-        if keyword == "":
-            self.current_df_view = df.copy()
+        if not terms:
+            self.current_df_view = df
         else:
-            mask = pd.Series(False, index=df.index)
-            for col in STRICT_COLUMNS:
-                mask = mask | df[col].astype(str).str.lower().str.contains(keyword, na=False)
-            self.current_df_view = df[mask].copy()
+            # every whitespace-separated term must appear somewhere in the row
+            haystack = self._get_search_index(self.selected_name)
+            mask = None
+            for term in terms:
+                pat = re.compile(re.escape(term), re.IGNORECASE)
+                hit = haystack.str.contains(pat, regex=True, na=False)
+                mask = hit if mask is None else mask & hit
+            self.current_df_view = df.loc[mask]
         self.refresh_table(self.current_df_view)
 
     def apply_date_filter(self):
@@ -394,51 +690,112 @@ class FeeManagerApp(QWidget):
         mon = self.month_combo.currentText()
         yr_text = self.filter_year.text().strip()
         path, df = self.files[self.selected_name]
-        try:
-            parsed = pd.to_datetime(df["Due Date"], errors='coerce')
-        except Exception:
-            QMessageBox.warning(self, "Date parse", "Could not parse Due Date column")
-            return
-        mask = pd.Series(True, index=df.index)
+        m = y = None
         if mon != "All":
-            mask = mask & (parsed.dt.month == int(mon))
+            m = int(mon)
         if yr_text:
             try:
                 y = int(yr_text)
-                mask = mask & (parsed.dt.year == y)
             except ValueError:
                 QMessageBox.warning(self, "Year", "Year must be numeric")
                 return
-        self.current_df_view = df[mask].copy()
+        try:
+            due = self._get_due_parsed(self.selected_name)
+        except Exception:
+            QMessageBox.warning(self, "Date parse", "Could not parse Due Date column")
+            return
+        conds = []
+        if m is not None:
+            conds.append("due_month == @m")
+        if y is not None:
+            conds.append("due_year == @y")
+        if conds:
+            # one fused expression (numexpr-backed when installed)
+            keep = due.query(" and ".join(conds)).index
+            self.current_df_view = df.loc[keep]
+        else:
+            self.current_df_view = df
         self.refresh_table(self.current_df_view)
 
+    def _get_search_index(self, name):
+        # one string per row, built once per file version from the NaN-free
+        # display strings so a blank cell can't null out the whole row
+        if name not in self._search_index:
+            df_str = self._get_display_strings(name)
+            hay = df_str[STRICT_COLUMNS[0]].str.cat(
+                [df_str[col] for col in STRICT_COLUMNS[1:]], sep="\x1f", na_rep="")
+            self._search_index[name] = hay
+        return self._search_index[name]
+
+    def _get_due_parsed(self, name):
+        # month/year of Due Date as int16 (0 where blank/unparseable)
+        if name not in self._due_parsed:
+            path, df = self.files[name]
+            parsed = pd.to_datetime(df["Due Date"], errors='coerce')
+            self._due_parsed[name] = pd.DataFrame({
+                "due_month": parsed.dt.month.fillna(0).astype("int16"),
+                "due_year": parsed.dt.year.fillna(0).astype("int16"),
+            }, index=df.index)
+        return self._due_parsed[name]
+
+    def _get_display_strings(self, name):
+        if name not in self._display_str:
+            path, df = self.files[name]
+            self._display_str[name] = to_display_strings(df)
+        return self._display_str[name]
+
+    def _invalidate_caches(self, name):
+        self._search_index.pop(name, None)
+        self._display_str.pop(name, None)
+        self._due_parsed.pop(name, None)
+
     def clear_filters(self):
         if not self.selected_name:
             return
         path, df = self.files[self.selected_name]
-        self.current_df_view = df.copy()
+        self.current_df_view = df
         self.refresh_table(self.current_df_view)
 
     # ---------- business rules ----------
-    def _recalculate_business_rules(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
+    def _recalc_full(self, df: pd.DataFrame) -> pd.DataFrame:
+        # works in place; only reorders (a new frame) when the schema is off
         for c in STRICT_COLUMNS:
             if c not in df.columns:
                 df[c] = ""
-        df = df[STRICT_COLUMNS]
+        if list(df.columns) != STRICT_COLUMNS:
+            df = df[STRICT_COLUMNS].copy()
+        for c in CATEGORY_COLUMNS:
+            df[c] = df[c].astype(object).where(df[c].notna(), "").astype(str).astype("category")
         df["Fee Amount"] = pd.to_numeric(df["Fee Amount"], errors='coerce').fillna(0).astype(int)
         df["Fee Paid"] = pd.to_numeric(df["Fee Paid"], errors='coerce').fillna(0).astype(int)
         df["Balance"] = (df["Fee Amount"] - df["Fee Paid"]).clip(lower=0).astype(int)
-        for idx, row in df.iterrows():
-            bal = int(row["Balance"])
-            if bal == 0:
-                if not row.get("Fee Paid On"):
-                    df.at[idx, "Fee Paid On"] = today_str()
-                df.at[idx, "Due Date"] = ""
-            else:
-                df.at[idx, "Fee Paid On"] = ""
+        df["Fee Paid On"] = df["Fee Paid On"].fillna("").astype(object)
+        df["Due Date"] = df["Due Date"].astype(object)
+        paid_mask = df["Balance"].eq(0)
+        need_stamp = paid_mask & df["Fee Paid On"].eq("")
+        df.loc[need_stamp, "Fee Paid On"] = today_str()
+        df.loc[paid_mask, "Due Date"] = ""
+        df.loc[~paid_mask, "Fee Paid On"] = ""
         return df
 
+    def _recalc_row(self, df: pd.DataFrame, idx):
+        # same rules as _recalc_full, for the single row labelled idx (in place)
+        amt = pd.to_numeric(df.at[idx, "Fee Amount"], errors='coerce')
+        paid = pd.to_numeric(df.at[idx, "Fee Paid"], errors='coerce')
+        amt = 0 if pd.isna(amt) else int(amt)
+        paid = 0 if pd.isna(paid) else int(paid)
+        bal = max(0, amt - paid)
+        df.at[idx, "Fee Amount"] = amt
+        df.at[idx, "Fee Paid"] = paid
+        df.at[idx, "Balance"] = bal
+        if bal == 0:
+            paid_on = df.at[idx, "Fee Paid On"]
+            if pd.isna(paid_on) or paid_on == "":
+                df.at[idx, "Fee Paid On"] = today_str()
+            df.at[idx, "Due Date"] = ""
+        else:
+            df.at[idx, "Fee Paid On"] = ""
+
     # ---------- PDF export ----------
     def export_pdf(self):
         if self.current_df_view is None or self.current_df_view.empty:
@@ -455,7 +812,7 @@ class FeeManagerApp(QWidget):
 
     def _build_pdf(self, df: pd.DataFrame, out_path: str):
         from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer
         from reportlab.lib import colors
         from reportlab.lib.styles import getSampleStyleSheet
 
@@ -468,21 +825,20 @@ class FeeManagerApp(QWidget):
 
     # Filter DataFrame to only those columns (ignore if missing)
         available_cols = [col for col in pdf_columns if col in df.columns]
-        data = [available_cols]  # header row
-
-    # Add the rows with only these columns, converting NaNs to empty strings
-        for _, row in df.iterrows():
-            row_data = [str(row[col]) if pd.notna(row[col]) else "" for col in available_cols]
-            data.append(row_data)
-
-        table = Table(data, repeatRows=1)
-        table.setStyle(TableStyle([
+        style = TableStyle([
             ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#4F81BD")),
             ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
             ("ALIGN", (0, 0), (-1, -1), "CENTER"),
             ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
             ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-        ]))
+        ])
+
+    # Add the rows with only these columns, converting NaNs to empty strings
+        sub = df[available_cols]
+        rows = np.where(sub.notna().values, sub.astype(str).values, "").tolist()
+        # LongTable paginates itself and repeats the header on each page
+        table = LongTable([available_cols] + rows, repeatRows=1)
+        table.setStyle(style)
         elems.append(table)
         doc.build(elems)
 
@@ -491,18 +847,21 @@ class FeeManagerApp(QWidget):
         if not self.selected_name:
             QMessageBox.warning(self, "No file", "Open a strict file first")
             return
+        if self._mail_worker is not None:
+            QMessageBox.warning(self, "Busy", "Reminders are already being sent")
+            return
         choice, ok = QInputDialog.getItem(self, "Reminders", "Send to:", ["All with dues", "Selected row only"], 0, False)
         if not ok:
             return
         path, df = self.files[self.selected_name]
-        df = self._recalculate_business_rules(df)
+        df = self._recalc_full(df)
         recipients = []
         if choice == "Selected row only":
-            r = self.table.currentRow()
+            r = self.table.currentIndex().row()
             if r < 0:
                 QMessageBox.warning(self, "Select", "Select a row first")
                 return
-            row = df.iloc[r]
+            row = df.loc[self._view_to_base[r]]
             if int(row["Balance"]) <= 0:
                 QMessageBox.information(self, "No due", "Selected row has no due balance")
                 return
@@ -533,38 +892,35 @@ class FeeManagerApp(QWidget):
         if not ok:
             return
 
-        failed = []
-        sent = 0
-        for row in recipients:
-            to = row["Email"]
-            if not to or str(to).strip() == "":
-                failed.append(("(no email)", "missing email"))
-                continue
-            subject = "Fee Payment Reminder"
-            body = f"Hello {row['Name']},\n\nThis is a gentle reminder that your pending fee balance is{row['Balance']}.\n"
-            if row.get("Due Date"):
-                body += f"Due Date: {row['Due Date']}\n"
-            body += f"Kindly make the payment at the earliest to avoid any late charges.\nIf you have already completed the payment, please disregard this message.\nThank you for your prompt attention.\nPlease pay at the earliest.\n\nRegards,\nPyLinX Hub"
-            msg = MIMEText(body)
-            msg["Subject"] = subject
-            msg["From"] = sender
-            msg["To"] = to
-            try:
-                server = smtplib.SMTP(smtp_server, smtp_port, timeout=20)
-                server.ehlo()
-                server.starttls()
-                server.ehlo()
-                server.login(sender, password)
-                server.sendmail(sender, [to], msg.as_string())
-                server.quit()
-                sent += 1
-            except Exception as e:
-                # record exact exception string so user can see what's wrong
-                failed.append((to, str(e)))
-
+        # send on a pool thread so the UI stays responsive
+        smtp_cfg = {"server": smtp_server, "port": smtp_port, "sender": sender, "password": password}
+        worker = MailWorker([row.to_dict() for row in recipients], smtp_cfg)
+        self._mail_failed = []
+        self._mail_progress = QProgressDialog("Sending reminders...", None, 0, len(recipients), self)
+        self._mail_progress.setWindowTitle("Email")
+        self._mail_progress.setWindowModality(Qt.WindowModal)
+        self._mail_progress.setMinimumDuration(0)
+        worker.signals.progress.connect(self._on_mail_progress)
+        worker.signals.failed.connect(self._on_mail_failed)
+        worker.signals.done.connect(self._on_mail_done)
+        self._mail_worker = worker  # keep the signals object alive until done
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_mail_progress(self, done, total):
+        self._mail_progress.setValue(done)
+
+    def _on_mail_failed(self, to, err):
+        self._mail_failed.append((to, err))
+
+    def _on_mail_done(self, sent, skipped):
+        self._mail_progress.close()
+        self._mail_worker = None
+        failed = self._mail_failed
         info = f"Sent: {sent}"
         if failed:
             info += f", Failed: {len(failed)}"
+        if skipped:
+            info += f", Skipped: {skipped} (sending aborted)"
         # show details if any failed
         if failed:
             details = "\n".join([f"{t}: {err}" for t, err in failed[:10]])